@@ -1,9 +1,21 @@
-import time, os, hashlib, json, re, urllib.parse as up
+import asyncio, codecs, os, hashlib, math, re, ssl, urllib.parse as up
 from pathlib import Path
+import aiohttp
+import orjson
+import charset_normalizer
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from selectolax.lexbor import LexborHTMLParser
 from urllib import robotparser
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet copies of the indexes are optional
+    pa = pq = None
 
 ROOT = "https://www.doctify.com"
 OUT = Path("mirror")
@@ -14,9 +26,10 @@ RAW.mkdir(parents=True, exist_ok=True)
 META.mkdir(parents=True, exist_ok=True)
 EXTRACTED.mkdir(parents=True, exist_ok=True)
 
+USER_AGENT = "SolVX-Mirror/1.0 (+contact: you@example.com)"
 SESSION = requests.Session()
 SESSION.headers.update({
-    "User-Agent": "SolVX-Mirror/1.0 (+contact: you@example.com)"
+    "User-Agent": USER_AGENT
 })
 
 def canon(u: str) -> str:
@@ -41,9 +54,15 @@ def url_to_path(u: str) -> Path:
         p = RAW / safe / "index.html"
     return p
 
-def save_text(path: Path, text: str):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
+_made_dirs: set[Path] = set()
+
+def save_text(path: Path, data: bytes):
+    # Each directory is created once per process instead of stat-ing its ancestors per page
+    parent = path.parent
+    if parent not in _made_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _made_dirs.add(parent)
+    path.write_bytes(data)
 
 def load_robots(root: str):
     rp = robotparser.RobotFileParser()
@@ -56,41 +75,164 @@ def load_robots(root: str):
 
 def sitemap_seeds(root: str):
     seeds = set()
-    try:
-        r = SESSION.get(up.urljoin(root, "/sitemap.xml"), timeout=20)
-        if r.ok:
-            soup = BeautifulSoup(r.text, "xml")
-            for loc in soup.find_all("loc"):
-                seeds.add(canon(loc.text.strip()))
-    except Exception:
-        pass
+    pending = deque(up.urljoin(root, p) for p in ("/sitemap.xml", "/sitemap_index.xml"))
+    visited = set()
+    while pending:
+        sm_url = pending.popleft()
+        if sm_url in visited:
+            continue
+        visited.add(sm_url)
+        try:
+            r = SESSION.get(sm_url, stream=True, timeout=20)
+        except Exception:
+            continue
+        try:
+            if not r.ok:
+                continue
+            r.raw.decode_content = True
+            # Stream <url>/<sitemap> entries and drop each one once read,
+            # so large sitemap indexes never build a full tree in memory
+            for _, elem in etree.iterparse(r.raw, tag=("{*}url", "{*}sitemap"),
+                                           resolve_entities=False, no_network=True):
+                loc = (elem.findtext("{*}loc") or "").strip()
+                if loc and in_scope(loc):
+                    if etree.QName(elem).localname == "sitemap":
+                        pending.append(loc)
+                    else:
+                        seeds.add(canon(loc))
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        except Exception:
+            pass
+        finally:
+            r.close()
     return seeds
 
-def likely_dynamic(html: str) -> bool:
-    if "enable javascript" in html.lower():
+def sniff_encoding(resp, body: bytes) -> str:
+    # Only consulted by aiohttp when the server declares no charset
+    best = charset_normalizer.from_bytes(body).best()
+    return best.encoding if best else "utf-8"
+
+_NOSCRIPT_RE = re.compile(rb"enable javascript", re.I)
+
+def likely_dynamic(tree: LexborHTMLParser, html: bytes) -> bool:
+    if _NOSCRIPT_RE.search(html):
         return True
-    scripts = html.lower().count("<script")
-    txt = BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+    scripts = len(tree.css("script"))
+    # Script/style bodies are not visible text (this mutates the tree, so run it last)
+    tree.strip_tags(["script", "style"])
+    txt = tree.body.text(separator=" ", strip=True) if tree.body else ""
     return scripts > 20 or len(txt) < 400
 
-def triage_record(url: str, html: str):
-    soup = BeautifulSoup(html, "html.parser")
-    title = (soup.title.string.strip() if soup.title and soup.title.string else "")
-    h1 = (soup.find("h1").get_text(strip=True) if soup.find("h1") else "")
-    links = sorted({canon(a.get("href","")) for a in soup.find_all("a", href=True) if in_scope(a["href"])})
+def triage_record(url: str, tree: LexborHTMLParser):
+    title_node = tree.css_first("title")
+    title = title_node.text().strip() if title_node else ""
+    h1_node = tree.css_first("h1")
+    h1 = h1_node.text(strip=True) if h1_node else ""
+    hrefs = (a.attributes.get("href") or "" for a in tree.css("a[href]"))
+    links = sorted({canon(href) for href in hrefs if in_scope(href)})
     return {"url": url, "title": title, "h1": h1, "links": links[:200]}
 
+def hash_backend() -> str:
+    # hashlib uses OpenSSL's EVP sha256 (SHA-NI accelerated on capable CPUs)
+    # unless Python was built without it
+    backend = ssl.OPENSSL_VERSION if hashlib.sha256.__name__.startswith("openssl_") else "builtin"
+    try:
+        sha_ni = "sha_ni" in Path("/proc/cpuinfo").read_text()
+    except OSError:
+        sha_ni = False
+    return f"sha256 via {backend}, SHA-NI {'available' if sha_ni else 'not detected'}"
+
+def parse_worker(url: str, html_bytes: bytes, path: Path, encoding: str):
+    """Runs in the process pool: save, triage, fingerprint and dynamic check for one page."""
+    # The mirror is always UTF-8; only other charsets need transcoding
+    if codecs.lookup(encoding).name == "utf-8":
+        save_text(path, html_bytes)
+    else:
+        save_text(path, html_bytes.decode(encoding, "replace").encode("utf-8"))
+    tree = LexborHTMLParser(html_bytes)
+    rec = triage_record(url, tree)
+    h = hashlib.sha256(html_bytes).hexdigest()
+    return rec, h, likely_dynamic(tree, html_bytes)
+
+SEEN_FILE = META / "seen_urls.txt"
+SEEN_LOG = META / "seen_urls.log"
+COMPACT_EVERY = 10_000
+WRITE_BUFFER = 64 * 1024
+
 def load_seen():
-    seen_file = META / "seen_urls.txt"
-    if seen_file.exists():
-        return set(seen_file.read_text(encoding="utf-8").splitlines())
-    return set()
+    seen = set()
+    for seen_file in (SEEN_FILE, SEEN_LOG):
+        if seen_file.exists():
+            seen.update(seen_file.read_text(encoding="utf-8").splitlines())
+    return seen
 
-def save_seen(seen):
-    seen_file = META / "seen_urls.txt"
-    seen_file.write_text("\n".join(sorted(seen)), encoding="utf-8")
+def compact_seen(seen_fp):
+    # Checkpoint first, then drop the log: a crash in between only leaves duplicates
+    seen_fp.flush()
+    SEEN_FILE.write_text("\n".join(sorted(load_seen())), encoding="utf-8")
+    seen_fp.truncate(0)
 
-def main():
+def url_key(u: str) -> bytes:
+    # 8-byte digest: exact enough for membership, a fraction of the str's size
+    return hashlib.sha1(u.encode("utf-8")).digest()[:8]
+
+class BloomFilter:
+    """Fixed-size Bloom filter used to dedup the crawl frontier."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        d = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+class ParquetLog:
+    """Collects records column by column and writes them to a Parquet part file in batches."""
+
+    def __init__(self, directory: Path, schema, batch_size: int = 256):
+        # Parquet files cannot be appended to, so every run writes its own part
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"part-{datetime.now():%Y%m%d-%H%M%S}.parquet"
+        self.schema = schema
+        self.batch_size = batch_size
+        self.columns = {name: [] for name in schema.names}
+        self.writer = None
+
+    def append(self, rec: dict):
+        for name, values in self.columns.items():
+            values.append(rec[name])
+        if len(self.columns["url"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.columns["url"]:
+            return
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self.writer.write_batch(pa.RecordBatch.from_pydict(self.columns, schema=self.schema))
+        for values in self.columns.values():
+            values.clear()
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+
+async def crawl():
+    print(f"[INFO] {hash_backend()}")
     rp = load_robots(ROOT)
     seeds = sitemap_seeds(ROOT) or {ROOT}
     # Expand seeds for Stage 4: practitioners, clinics, specialists
@@ -99,65 +241,138 @@ def main():
         canon("https://www.doctify.com/uk/clinic/"),
         canon("https://www.doctify.com/uk/specialists/"),
     }
-    q = deque(sorted(seeds))
-    seen = load_seen()
-    crawl_delay = 1.0
+    q = asyncio.Queue()
+    for seed in sorted(seeds):
+        q.put_nowait(seed)
+    # Frontier dedup is probabilistic; the fetched check stays exact
+    enqueued = BloomFilter(capacity=1_000_000, error_rate=1e-7)
+    fetched = set()
+    for u in load_seen():
+        enqueued.add(u)
+        fetched.add(url_key(u))
+    seen_fp = SEEN_LOG.open("a", encoding="utf-8", buffering=1)
+    compact_seen(seen_fp)
+    crawl_delay = 1.0  # per host, shared by all workers
     max_pages = 1200  # increased for Stage 4 expansion
+    workers = 16
     processed = 0
 
-    idx_fp = (META / "crawl_index.jsonl").open("a", encoding="utf-8")
-    triage_fp = (EXTRACTED / "quick_index.jsonl").open("a", encoding="utf-8")
-    dyn_fp = (META / "dynamic_queue.txt").open("a", encoding="utf-8")
+    loop = asyncio.get_running_loop()
+    last_fetch = {}
+    host_locks = {}
 
-    while q and processed < max_pages:
-        url = q.popleft()
-        if url in seen:
-            continue
-        seen.add(url)
+    async def wait_turn(host: str):
+        lock = host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            delay = last_fetch.get(host, 0.0) + crawl_delay - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            last_fetch[host] = loop.time()
+
+    # Binary appends with a 64 KiB buffer: records go out in batches, not a syscall per line
+    idx_fp = (META / "crawl_index.jsonl").open("ab", buffering=WRITE_BUFFER)
+    triage_fp = (EXTRACTED / "quick_index.jsonl").open("ab", buffering=WRITE_BUFFER)
+    dyn_fp = (META / "dynamic_queue.txt").open("ab", buffering=WRITE_BUFFER)
+    # Columnar copies for downstream analysis; the JSONL files stay the source of truth
+    parquet_logs = {}
+    if pa is not None:
+        parquet_logs["index"] = ParquetLog(META / "crawl_index", pa.schema([
+            ("url", pa.string()), ("status", pa.int16()), ("sha256", pa.string()),
+            ("saved", pa.string()), ("type", pa.string()),
+        ]))
+        parquet_logs["triage"] = ParquetLog(EXTRACTED / "quick_index", pa.schema([
+            ("url", pa.string()), ("title", pa.string()), ("h1", pa.string()),
+            ("links", pa.list_(pa.string())),
+        ]))
+
+    async def fetch(session, executor, url):
+        nonlocal processed
+        key = url_key(url)
+        if processed >= max_pages or key in fetched:
+            return
+        fetched.add(key)
+        seen_fp.write(url + "\n")
         processed += 1
         try:
-            if rp and not rp.can_fetch(SESSION.headers["User-Agent"], url):
-                continue
-            r = SESSION.get(url, timeout=25)
-            time.sleep(crawl_delay)
+            if rp and not rp.can_fetch(USER_AGENT, url):
+                return
+            await wait_turn(up.urlsplit(url).netloc)
+            async with session.get(url) as resp:
+                if not resp.ok:
+                    return
+                html_bytes = await resp.read()
+                status = resp.status
+                encoding = resp.get_encoding()
         except Exception as e:
             print(f"[WARN] Skipped {url}: {e}")
-            continue
-        if not r.ok:
-            continue
+            return
 
-        html = r.text
         path = url_to_path(url)
-        save_text(path, html)
-        h = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        # Parsing is CPU-bound and the mirror write blocks; keep both off the event loop
+        rec, h, dynamic = await loop.run_in_executor(executor, parse_worker, url, html_bytes, path, encoding)
 
-        rec = triage_record(url, html)
         for link in rec["links"]:
-            if in_scope(link) and link not in seen:
-                q.append(link)
+            if in_scope(link) and link not in enqueued:
+                enqueued.add(link)
+                q.put_nowait(link)
 
-        if likely_dynamic(html):
-            dyn_fp.write(url + "\n")
-            dyn_fp.flush()
+        if dynamic:
+            dyn_fp.write(url.encode("utf-8") + b"\n")
 
-        idx_fp.write(json.dumps({
+        entry = {
             "url": url,
-            "status": r.status_code,
+            "status": status,
             "sha256": h,
             "saved": str(path.relative_to(OUT)),
             "type": "static",
-        }) + "\n")
-        idx_fp.flush()
-
-        triage_fp.write(json.dumps(rec) + "\n")
-        triage_fp.flush()
+        }
+        idx_fp.write(orjson.dumps(entry) + b"\n")
+        triage_fp.write(orjson.dumps(rec) + b"\n")
+        if parquet_logs:
+            parquet_logs["index"].append(entry)
+            parquet_logs["triage"].append(rec)
 
         if processed % 50 == 0:
-            save_seen(seen)
             print(f"[INFO] Processed {processed} pages...")
+        if processed % COMPACT_EVERY == 0:
+            for fp in (idx_fp, triage_fp, dyn_fp):
+                fp.flush()
+            compact_seen(seen_fp)
+
+    async def worker(session, executor):
+        while True:
+            url = await q.get()
+            try:
+                await fetch(session, executor, url)
+            except Exception as e:
+                print(f"[WARN] Failed {url}: {e}")
+            finally:
+                q.task_done()
+
+    connector = aiohttp.TCPConnector(limit_per_host=2, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=25)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={"User-Agent": USER_AGENT},
+                                         fallback_charset_resolver=sniff_encoding) as session:
+            tasks = [asyncio.create_task(worker(session, executor)) for _ in range(workers)]
+            try:
+                await q.join()
+            finally:
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                for fp in (idx_fp, triage_fp, dyn_fp):
+                    fp.close()
+                for log in parquet_logs.values():
+                    log.close()
 
-    save_seen(seen)
+    compact_seen(seen_fp)
+    seen_fp.close()
     print(f"\n[INFO] Crawl complete — processed {processed} pages.\n")
 
+def main():
+    asyncio.run(crawl())
+
 if __name__ == "__main__":
     main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Doctify Site Mirror Extraction Pipeline
-Extracts structured data from HTML files using BeautifulSoup based on schema definitions.
+Extracts structured data from HTML files using lxml (or selectolax) CSS selectors based on schema definitions.
 """
 
 import json
@@ -10,20 +10,33 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Union
 from urllib.parse import urlparse
 import hashlib
 import unicodedata
 import logging
+import mmap
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 try:
-    from bs4 import BeautifulSoup
+    import lxml.html
+    from cssselect import HTMLTranslator
+    from lxml.etree import ParserError, XPath
+    from lxml.html import HtmlElement
+    import orjson
     import yaml
 except ImportError as e:
     print(f"Missing required dependency: {e}")
-    print("Install with: pip install beautifulsoup4 pyyaml lxml")
+    print("Install with: pip install lxml cssselect orjson pyyaml")
     sys.exit(1)
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # the lxml backend still works without it
+    LexborHTMLParser = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,26 +44,198 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for the per-field hot path
+_WS_RE = re.compile(r'\s+')
+_ZW_RE = re.compile(r'[\u200b-\u200d\ufeff]')
+_SLUG_NON = re.compile(r'[^a-zA-Z0-9]+')
+_SLUG_DASH = re.compile(r'-{2,}')
+_DROP_SEG = re.compile(r'(uk|en|blog|category|tag|page|\d{1,2}|\d{4})$', re.I)
+_YEAR_RE = re.compile(r'\d{4}')
+
+# Mirror files are always written as UTF-8 by the crawler and renderer
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_CSS_TRANSLATOR = HTMLTranslator()
+
+# Elements whose strings BeautifulSoup's get_text() leaves out of an ancestor's text
+_TEXT_SKIP = frozenset(('script', 'style', 'template', 'rt', 'rp'))
+_TEXT_NODES = XPath(
+    "descendant::text()[not(ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]",
+    smart_strings=False,
+)
+_LEXBOR_TEXT_SKIP = ', '.join(sorted(_TEXT_SKIP))
+
+PARSERS = ('lexbor', 'lxml')
+# lxml measured as fast as lexbor on mirror pages and needs no extra dependency
+DEFAULT_PARSER = 'lxml'
+
+
+@lru_cache(maxsize=None)
+def _compile_css(selector: str) -> XPath:
+    """Compile a CSS selector to XPath once per process"""
+    # Descendants only, so a sub-element never matches itself
+    return XPath(_CSS_TRANSLATOR.css_to_xpath(selector, prefix='descendant::'))
+
+
+class _LxmlNode:
+    """lxml element exposed through the node API used by the extractor"""
+
+    __slots__ = ('el',)
+
+    def __init__(self, el: HtmlElement):
+        self.el = el
+
+    def select(self, selector: str) -> List['_LxmlNode']:
+        return [_LxmlNode(el) for el in _compile_css(selector)(self.el)]
+
+    def select_one(self, selector: str) -> Optional['_LxmlNode']:
+        matches = _compile_css(selector)(self.el)
+        return _LxmlNode(matches[0]) if matches else None
+
+    def get(self, attribute: str, default: str = '') -> str:
+        return self.el.get(attribute, default)
+
+    def get_text(self) -> str:
+        if self.el.tag in _TEXT_SKIP:
+            # Asked directly, a script or style still yields its own contents
+            return self.el.text_content()
+        return ''.join(_TEXT_NODES(self.el))
+
+    def to_html(self) -> str:
+        return lxml.html.tostring(self.el, encoding='unicode', with_tail=False)
+
+
+class _LexborNode:
+    """selectolax (lexbor) node exposed through the same API; matching runs entirely in C"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector: str) -> List['_LexborNode']:
+        # lexbor reports a node once per matching part of a selector list. Nodes are compared
+        # by mem_id: selectolax's == serializes both subtrees to HTML
+        own_id = self.node.mem_id
+        matches = {n.mem_id: n for n in self.node.css(selector)}
+        return [_LexborNode(n) for mem_id, n in matches.items() if mem_id != own_id]
+
+    def select_one(self, selector: str) -> Optional['_LexborNode']:
+        found = self.node.css_first(selector)
+        own_id = self.node.mem_id
+        if found is not None and found.mem_id == own_id:
+            # lexbor includes the node itself, once per matching part of a selector list;
+            # keep descendant-only scoping
+            found = next((n for n in self.node.css(selector) if n.mem_id != own_id), None)
+        return _LexborNode(found) if found is not None else None
+
+    def get(self, attribute: str, default: str = '') -> str:
+        value = self.node.attributes.get(attribute)
+        return default if value is None else value
+
+    def get_text(self) -> str:
+        node = self.node
+        if node.tag in _TEXT_SKIP or node.css_first(_LEXBOR_TEXT_SKIP) is None:
+            return node.text(deep=True)
+        # Walk the subtree, skipping the same elements the lxml backend leaves out
+        parts = []
+        stack = [node.child]
+        while stack:
+            child = stack.pop()
+            while child is not None:
+                tag = child.tag
+                if tag == '-text':
+                    parts.append(child.text_content)
+                elif tag not in _TEXT_SKIP and child.child is not None:
+                    stack.append(child.next)
+                    child = child.child
+                    continue
+                child = child.next
+        return ''.join(parts)
+
+    def to_html(self) -> str:
+        return self.node.html
+
+
+Node = Union[_LxmlNode, _LexborNode]
+
+
+def parse_html(html_content: Union[bytes, mmap.mmap], parser: str = DEFAULT_PARSER) -> Optional[Node]:
+    """Parse raw HTML bytes (or, for lxml, any bytes-like buffer) into a root node for the chosen backend"""
+    if parser == 'lexbor':
+        return _LexborNode(LexborHTMLParser(html_content).root)
+    try:
+        return _LxmlNode(lxml.html.document_fromstring(html_content, parser=_HTML_PARSER))
+    except ParserError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def _field_pattern(config: Dict) -> Optional[re.Pattern]:
+    """Compiled 'pattern' of a field config; configs not loaded through the schema are compiled on demand"""
+    compiled = config.get('_pattern_re')
+    if compiled is None and isinstance(config.get('pattern'), str) and config['pattern']:
+        compiled = _compile_pattern(config['pattern'])
+    return compiled
+
+
+@lru_cache(maxsize=4096)
+def _slugify(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = _SLUG_NON.sub("-", text).strip("-").lower()
+    return _SLUG_DASH.sub("-", text)
+
+
+def _walk_html(base: Path):
+    """Yield (relative path, path) for every .html file under base, via os.scandir"""
+    stack = [base]
+    base_len = len(str(base)) + 1
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.html') and entry.is_file():
+                    yield entry.path[base_len:], Path(entry.path)
+
 
 class DoctifyExtractor:
     """Main extractor class for Doctify site mirror data"""
 
-    def __init__(self, schema_dir: str = "schema", mirror_dir: str = "mirror"):
+    def __init__(self, schema_dir: str = "schema", mirror_dir: str = "mirror", parser: str = DEFAULT_PARSER):
         """
         Initialize the extractor with schema and mirror directories.
 
         Args:
             schema_dir: Path to directory containing schema YAML files
             mirror_dir: Path to mirror directory containing HTML files
+            parser: HTML backend, 'lxml' or 'lexbor' (selectolax)
         """
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser: {parser}")
+        if parser == 'lexbor' and LexborHTMLParser is None:
+            raise ImportError("selectolax is required for the lexbor parser (pip install selectolax), or use the default lxml parser")
+
         self.schema_dir = Path(schema_dir)
         self.mirror_dir = Path(mirror_dir)
+        self.parser = parser
         self.entities_schema = None
         self.selectors_schema = None
 
         # Track selector hit rates
         self.selector_hits = {}
 
+        # Raw content of the file being processed (see process_file)
+        self._html_bytes = None
+
         # Load schemas
         self._load_schemas()
 
@@ -70,57 +255,127 @@ class DoctifyExtractor:
         with open(selectors_path, 'r', encoding='utf-8') as f:
             self.selectors_schema = yaml.safe_load(f)
 
+        # Compile field patterns once instead of on every extraction
+        for section in self.selectors_schema.values():
+            if not isinstance(section, dict):
+                continue
+            for field_config in section.values():
+                if isinstance(field_config, dict) and isinstance(field_config.get('pattern'), str):
+                    field_config['_pattern_re'] = _compile_pattern(field_config['pattern'])
+
+        if self.parser == 'lxml':
+            self._compile_selectors(self.selectors_schema)
+
+        self._detection = self._compile_detection(self.selectors_schema.get('page_type_detection', {}))
+
         logger.info("Schemas loaded successfully")
 
-    def detect_page_type(self, url: str, soup: BeautifulSoup) -> Optional[str]:
+    def _compile_detection(self, detection_rules: Dict) -> tuple:
+        """
+        Flatten page type rules into lookup tables tagged with each rule's position.
+
+        Returns:
+            (page types in rule order, compiled URL patterns sorted by rule,
+             meta checks grouped by selector, lowercased body class patterns sorted by rule)
+        """
+        page_types = list(detection_rules)
+        url_patterns = []
+        meta_rules: Dict[str, List[tuple]] = {}
+        body_patterns = []
+
+        for index, (page_type, rules) in enumerate(detection_rules.items()):
+            url_pattern = rules.get('url_pattern')
+            if url_pattern:
+                # Compiled one rule at a time, so inline flags and backreferences keep their meaning
+                try:
+                    url_patterns.append((re.compile(url_pattern), index))
+                except re.error as e:
+                    logger.warning(f"Invalid URL pattern for {page_type!r}: {e}")
+            for meta_rule in rules.get('meta_patterns', []):
+                meta_rules.setdefault(meta_rule.get('selector'), []).append(
+                    (meta_rule.get('attribute'), meta_rule.get('value').lower(), index))
+            for pattern in rules.get('body_class_patterns', []):
+                # A pattern spanning whitespace can never fall inside a single class
+                if pattern and not any(ch.isspace() for ch in pattern):
+                    body_patterns.append((pattern.lower(), index))
+
+        grouped_meta = sorted(meta_rules.items(), key=lambda item: item[1][0][2])
+        return page_types, url_patterns, grouped_meta, body_patterns
+
+    def _compile_selectors(self, node: Any):
+        """Translate every CSS selector in the schema to XPath once, up front"""
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == 'selector' and isinstance(value, str):
+                    self._try_compile(value)
+                elif key == 'selectors' and isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, str):
+                            self._try_compile(item)
+                self._compile_selectors(value)
+        elif isinstance(node, list):
+            for item in node:
+                self._compile_selectors(item)
+
+    def _try_compile(self, selector: str):
+        try:
+            _compile_css(selector)
+        except Exception as e:
+            logger.warning(f"Invalid CSS selector {selector!r}: {e}")
+
+    def detect_page_type(self, url: str, root: Node) -> Optional[str]:
         """
         Detect the type of page based on URL patterns and HTML content.
 
         Args:
             url: The page URL
-            soup: BeautifulSoup object of the page
+            root: Parsed root element of the page
 
         Returns:
             Page type string or None if not detected
         """
-        detection_rules = self.selectors_schema.get('page_type_detection', {})
+        page_types, url_patterns, meta_rules, body_patterns = self._detection
 
-        for page_type, rules in detection_rules.items():
-            # Check URL pattern
-            url_pattern = rules.get('url_pattern')
-            if url_pattern and re.match(url_pattern, url):
-                return page_type
-
-            # Check meta patterns
-            meta_patterns = rules.get('meta_patterns', [])
-            for meta_rule in meta_patterns:
-                selector = meta_rule.get('selector')
-                attribute = meta_rule.get('attribute')
-                expected_value = meta_rule.get('value')
-
-                element = soup.select_one(selector)
-                if element:
-                    actual_value = element.get(attribute, '').lower()
-                    if expected_value.lower() in actual_value:
-                        return page_type
-
-            # Check body class patterns
-            body_classes = rules.get('body_class_patterns', [])
-            body = soup.find('body')
-            if body:
-                classes = body.get('class', [])
-                for pattern in body_classes:
-                    if any(pattern.lower() in c.lower() for c in classes):
-                        return page_type
-
-        return None
+        # Rules are tried in schema order, so only earlier rules can beat a URL match
+        best = len(page_types)
+        for pattern, index in url_patterns:
+            if pattern.match(url):
+                best = index
+                break
 
-    def extract_field(self, soup: BeautifulSoup, field_config: Dict, url: str = "") -> Any:
+        for selector, checks in meta_rules:
+            if checks[0][2] >= best:
+                break
+            element = root.select_one(selector)
+            if element is None:
+                continue
+            for attribute, expected_value, index in checks:
+                if index >= best:
+                    break
+                if expected_value in element.get(attribute, '').lower():
+                    best = index
+                    break
+
+        if body_patterns and body_patterns[0][1] < best:
+            body = root.select_one('body')
+            if body is not None:
+                # Patterns hold no whitespace, so a substring of the joined list lies within one class
+                classes = ' '.join(body.get('class', '').split()).lower()
+                for pattern, index in body_patterns:
+                    if index >= best:
+                        break
+                    if pattern in classes:
+                        best = index
+                        break
+
+        return page_types[best] if best < len(page_types) else None
+
+    def extract_field(self, root: Node, field_config: Dict, url: str = "") -> Any:
         """
         Extract a single field value based on selector configuration.
 
         Args:
-            soup: BeautifulSoup object
+            root: Page root element, or a sub-element to search within
             field_config: Field configuration from selectors schema
             url: Page URL (for URL-based extraction)
 
@@ -130,7 +385,7 @@ class DoctifyExtractor:
         method = field_config.get('method', 'text')
         selectors = field_config.get('selectors', [])
         fallback = field_config.get('fallback')
-        pattern = field_config.get('pattern')
+        pattern = _field_pattern(field_config)
         field_type = field_config.get('type', 'string')
 
         # Handle special methods
@@ -138,10 +393,10 @@ class DoctifyExtractor:
             return self._extract_from_url(url, field_config)
 
         if method == 'canonical_url':
-            return self._extract_canonical_url(soup)
+            return self._extract_canonical_url(root)
 
         if method == 'json_ld':
-            return self._extract_json_ld(soup, field_config)
+            return self._extract_json_ld(root, field_config)
 
         # Try each selector in order
         value = None
@@ -160,33 +415,33 @@ class DoctifyExtractor:
 
             # Extract value based on method
             if sel_method == 'text':
-                element = soup.select_one(selector)
-                if element:
+                element = root.select_one(selector)
+                if element is not None:
                     value = self._clean_text(element.get_text())
 
             elif sel_method == 'html':
-                element = soup.select_one(selector)
-                if element:
-                    value = str(element)
+                element = root.select_one(selector)
+                if element is not None:
+                    value = element.to_html()
 
             elif sel_method == 'attribute' or attribute:
-                element = soup.select_one(selector)
-                if element and attribute:
+                element = root.select_one(selector)
+                if element is not None and attribute:
                     value = element.get(attribute, '')
 
             elif sel_method == 'text_list':
-                elements = soup.select(selector)
+                elements = root.select(selector)
                 value = [self._clean_text(el.get_text()) for el in elements]
                 value = [v for v in value if v]  # Remove empty strings
 
             elif sel_method == 'list':
-                elements = soup.select(selector)
+                elements = root.select(selector)
                 if attribute:
                     value = [el.get(attribute, '') for el in elements]
                     value = [v for v in value if v]
 
             elif sel_method == 'exists':
-                element = soup.select_one(selector)
+                element = root.select_one(selector)
                 value = element is not None
 
             # If we got a value, break and track the hit
@@ -211,33 +466,38 @@ class DoctifyExtractor:
 
     def _extract_from_url(self, url: str, config: Dict) -> Optional[str]:
         """Extract value from URL using regex pattern"""
-        pattern = config.get('pattern')
+        pattern = _field_pattern(config)
         group = config.get('group', 0)
 
         if not pattern:
             return None
 
-        match = re.search(pattern, url)
+        match = pattern.search(url)
         if match:
             return match.group(group)
         return None
 
-    def _extract_canonical_url(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_canonical_url(self, root: Node) -> Optional[str]:
         """Extract canonical URL from link tag"""
-        link = soup.select_one('link[rel="canonical"]')
-        if link:
+        link = root.select_one('link[rel="canonical"]')
+        if link is not None:
             return link.get('href')
         return None
 
-    def _extract_json_ld(self, soup: BeautifulSoup, config: Dict) -> Optional[Dict]:
+    def _extract_json_ld(self, root: Node, config: Dict) -> Optional[Dict]:
         """Extract and parse JSON-LD structured data"""
         selector = config.get('selector', 'script[type="application/ld+json"]')
         schema_types = config.get('schema_types', [])
 
-        scripts = soup.select(selector)
+        # Skip parsing every block when none of the wanted types occurs in the page at all
+        html_bytes = self._html_bytes
+        if html_bytes is not None and not any(html_bytes.find(t.encode('utf-8')) != -1 for t in schema_types):
+            return None
+
+        scripts = root.select(selector)
         for script in scripts:
             try:
-                data = json.loads(script.string)
+                data = orjson.loads(script.get_text())
 
                 # Handle @graph arrays
                 if isinstance(data, dict) and '@graph' in data:
@@ -251,7 +511,7 @@ class DoctifyExtractor:
                 elif isinstance(data, dict):
                     if data.get('@type') in schema_types:
                         return data
-            except (json.JSONDecodeError, AttributeError):
+            except (orjson.JSONDecodeError, AttributeError, TypeError):
                 continue
 
         return None
@@ -265,14 +525,14 @@ class DoctifyExtractor:
         text = text.strip()
 
         # Normalize spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
 
         # Remove zero-width characters
-        text = re.sub(r'[\u200b-\u200d\ufeff]', '', text)
+        text = _ZW_RE.sub('', text)
 
         return text
 
-    def _apply_pattern(self, value: Union[str, List], pattern: str) -> Union[str, List]:
+    def _apply_pattern(self, value: Union[str, List], pattern: re.Pattern) -> Union[str, List]:
         """Apply regex pattern to extract specific part of value"""
         if isinstance(value, list):
             return [self._apply_pattern(v, pattern) for v in value if v]
@@ -280,7 +540,7 @@ class DoctifyExtractor:
         if not isinstance(value, str):
             return value
 
-        match = re.search(pattern, value)
+        match = pattern.search(value)
         if match:
             return match.group(1) if match.groups() else match.group(0)
         return value
@@ -337,9 +597,7 @@ class DoctifyExtractor:
 
     def _slugify(self, text: str) -> str:
         """Convert text to URL-safe slug"""
-        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
-        text = re.sub(r"[^a-zA-Z0-9]+", "-", text).strip("-").lower()
-        return re.sub(r"-{2,}", "-", text)
+        return _slugify(text)
 
     def _derive_slug(self, canonical_url: str, title: str) -> str:
         """Derive a unique slug from canonical URL or title"""
@@ -348,14 +606,13 @@ class DoctifyExtractor:
             path = urlparse(canonical_url or "").path
         except Exception:
             pass
-        segs = [s for s in path.split("/") if s]
-        # Remove noisy/date segments
-        drop = re.compile(r"(uk|en|blog|category|tag|page|\d{1,2}|\d{4})$", re.I)
-        filtered = [s for s in segs if not drop.fullmatch(s)]
-        if filtered:
-            cand = filtered[-1].lower()
-            if not re.fullmatch(r"\d{4}", cand):
-                return cand
+        # Last segment that is not noise or a date
+        for seg in reversed(path.split("/")):
+            if seg and not _DROP_SEG.fullmatch(seg):
+                cand = seg.lower()
+                if not _YEAR_RE.fullmatch(cand):
+                    return cand
+                break
         if title:
             cand = self._slugify(title)
             if cand:
@@ -363,13 +620,13 @@ class DoctifyExtractor:
         h = hashlib.sha1((canonical_url or title or "x").encode("utf-8")).hexdigest()[:8]
         return f"post-{h}"
 
-    def extract_entity(self, page_type: str, soup: BeautifulSoup, url: str, html_path: str) -> Dict:
+    def extract_entity(self, page_type: str, root: Node, url: str, html_path: str) -> Dict:
         """
         Extract entity data from a page.
 
         Args:
             page_type: Type of page (practitioner, clinic, blog_post, etc.)
-            soup: BeautifulSoup object of the page
+            root: Parsed root element of the page
             url: Page URL
             html_path: Path to HTML file
 
@@ -385,7 +642,7 @@ class DoctifyExtractor:
                 continue
 
             try:
-                value = self.extract_field(soup, field_config, url)
+                value = self.extract_field(root, field_config, url)
                 entity_data[field_name] = value
             except Exception as e:
                 logger.warning(f"Error extracting {field_name} from {url}: {e}")
@@ -405,12 +662,12 @@ class DoctifyExtractor:
 
         return entity_data
 
-    def extract_reviews(self, soup: BeautifulSoup, entity_id: str, entity_type: str) -> List[Dict]:
+    def extract_reviews(self, root: Node, entity_id: str, entity_type: str) -> List[Dict]:
         """
         Extract reviews from a practitioner or clinic page.
 
         Args:
-            soup: BeautifulSoup object of the page
+            root: Parsed root element of the page
             entity_id: ID of the entity being reviewed
             entity_type: Type of entity (practitioner or clinic)
 
@@ -421,7 +678,7 @@ class DoctifyExtractor:
         container_selector = review_config.get('container', {}).get('selector', 'div.review')
 
         reviews = []
-        review_containers = soup.select(container_selector)
+        review_containers = root.select(container_selector)
 
         for idx, container in enumerate(review_containers):
             review_data = {
@@ -436,9 +693,8 @@ class DoctifyExtractor:
                     continue
 
                 try:
-                    # Create a temporary soup for this container
-                    temp_soup = BeautifulSoup(str(container), 'lxml')
-                    value = self.extract_field(temp_soup, field_config)
+                    # Search within the container node itself; no re-parse needed
+                    value = self.extract_field(container, field_config)
                     review_data[field_name] = value
                 except Exception as e:
                     logger.debug(f"Error extracting review field {field_name}: {e}")
@@ -463,16 +719,36 @@ class DoctifyExtractor:
             Dictionary containing entity data and reviews, or None if not processable
         """
         try:
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-        except Exception as e:
+            f = open(html_path, 'rb')
+        except OSError as e:
             logger.error(f"Error reading {html_path}: {e}")
             return None
 
-        soup = BeautifulSoup(html_content, 'lxml')
+        with f:
+            if self.parser == 'lxml' and os.fstat(f.fileno()).st_size:
+                # lxml parses straight from the page cache; no bytes copy of the file
+                html_content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # selectolax only takes str/bytes, and empty files cannot be mapped
+                html_content = f.read()
+            # Kept on self for byte-level prefilters during extraction
+            self._html_bytes = html_content
+            try:
+                return self._process_html(html_path, html_content)
+            finally:
+                self._html_bytes = None
+                if isinstance(html_content, mmap.mmap):
+                    html_content.close()
+
+    def _process_html(self, html_path: Path, html_content: Union[bytes, mmap.mmap]) -> Optional[Dict]:
+        """Extract entity data and reviews from the raw content of one file"""
+        root = parse_html(html_content, self.parser)
+        if root is None:
+            logger.debug(f"Could not parse {html_path}")
+            return None
 
         # Get URL from file (reconstruct or extract from canonical)
-        url = self._extract_canonical_url(soup)
+        url = self._extract_canonical_url(root)
         if not url:
             # Reconstruct from file path (works for both raw and rendered)
             if 'rendered' in str(html_path):
@@ -482,7 +758,7 @@ class DoctifyExtractor:
             url = f"https://{rel_path.parent}".replace(os.sep, '/')
 
         # Detect page type
-        page_type = self.detect_page_type(url, soup)
+        page_type = self.detect_page_type(url, root)
         if not page_type:
             logger.debug(f"Could not detect page type for {url}")
             return None
@@ -490,7 +766,7 @@ class DoctifyExtractor:
         logger.info(f"Processing {page_type}: {url}")
 
         # Extract entity data
-        entity_data = self.extract_entity(page_type, soup, url, str(html_path))
+        entity_data = self.extract_entity(page_type, root, url, str(html_path))
 
         result = {
             'page_type': page_type,
@@ -502,7 +778,7 @@ class DoctifyExtractor:
         if page_type in ('practitioner', 'clinic'):
             entity_id = entity_data.get('doctify_id')
             if entity_id:
-                reviews = self.extract_reviews(soup, entity_id, page_type)
+                reviews = self.extract_reviews(root, entity_id, page_type)
                 if reviews:
                     result['reviews'] = reviews
 
@@ -526,28 +802,19 @@ class DoctifyExtractor:
         for entity_type in entity_types:
             if format == 'jsonl':
                 file_path = output_path / f"{entity_type}.jsonl"
-                entity_files[entity_type] = open(file_path, 'w', encoding='utf-8')
-
-        # Find all HTML files - prefer rendered over raw
-        rendered_dir = self.mirror_dir / 'rendered'
-        raw_dir = self.mirror_dir / 'raw'
-
-        # Get all rendered files first
-        rendered_files = set(rendered_dir.rglob('*.html')) if rendered_dir.exists() else set()
-        raw_files = set(raw_dir.rglob('*.html')) if raw_dir.exists() else set()
-
-        # Create a mapping of relative paths to actual file paths (prefer rendered)
-        file_mapping = {}
-        for raw_file in raw_files:
-            rel_path = raw_file.relative_to(raw_dir)
-            file_mapping[rel_path] = raw_file
-
-        for rendered_file in rendered_files:
-            rel_path = rendered_file.relative_to(rendered_dir)
-            file_mapping[rel_path] = rendered_file  # Override raw with rendered
+                # Buffered binary writes: orjson emits bytes and lines go out in 64 KiB batches
+                entity_files[entity_type] = open(file_path, 'wb', buffering=64 * 1024)
+
+        # Find all HTML files in one walk per tree - rendered overrides raw
+        file_mapping: Dict[str, Path] = {}
+        for rel_path, html_path in _walk_html(self.mirror_dir / 'raw'):
+            file_mapping[rel_path] = html_path
+        rendered_count = 0
+        for rel_path, html_path in _walk_html(self.mirror_dir / 'rendered'):
+            file_mapping[rel_path] = html_path
+            rendered_count += 1
 
         html_files = list(file_mapping.values())
-        rendered_count = sum(1 for f in html_files if 'rendered' in str(f))
         logger.info(f"Found {len(html_files)} HTML files to process ({rendered_count} rendered, {len(html_files)-rendered_count} raw)")
 
         stats = {
@@ -562,49 +829,60 @@ class DoctifyExtractor:
         # Track seen slugs to detect and resolve collisions
         seen_slugs = {}
 
-        # Process each file
-        for html_path in html_files:
-            try:
-                result = self.process_file(html_path)
+        # Parse files across worker processes; results come back in file order
+        selector_hits = Counter()
+        jobs = [(html_path, str(self.schema_dir), str(self.mirror_dir), self.parser) for html_path in html_files]
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker,
+                                 initargs=(logger.level,)) as ex:
+            for html_path, result, hits, error in ex.map(_process_one, jobs, chunksize=16):
+                selector_hits.update(hits)
+
+                if error:
+                    logger.error(f"Error processing {html_path}: {error}")
+                    stats['errors'] += 1
+                    continue
 
                 if not result:
                     stats['skipped'] += 1
                     continue
 
-                page_type = result['page_type']
-                entity_data = result['entity']
-
-                # Handle slug collisions for blog_post
-                if page_type == 'blog_post' and 'slug' in entity_data:
-                    original_slug = entity_data['slug']
-                    if original_slug in seen_slugs:
-                        # Collision detected - append hash of URL
-                        url = entity_data.get('canonical_url') or entity_data.get('source_file', '')
-                        hash_suffix = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
-                        entity_data['slug'] = f"{original_slug}-{hash_suffix}"
-                        stats['slug_collisions'] += 1
-                        logger.debug(f"Slug collision resolved: {original_slug} -> {entity_data['slug']}")
-                    seen_slugs[entity_data['slug']] = True
-
-                # Write entity data
-                if page_type in entity_files:
-                    entity_files[page_type].write(json.dumps(entity_data) + '\n')
-                    stats['by_type'][page_type] = stats['by_type'].get(page_type, 0) + 1
-
-                # Write reviews if present
-                if 'reviews' in result and result['reviews']:
-                    for review in result['reviews']:
-                        entity_files['review'].write(json.dumps(review) + '\n')
-                    stats['by_type']['review'] = stats['by_type'].get('review', 0) + len(result['reviews'])
-
-                stats['processed'] += 1
-
-                if stats['processed'] % 10 == 0:
-                    logger.info(f"Processed {stats['processed']}/{stats['total']} files...")
+                try:
+                    page_type = result['page_type']
+                    entity_data = result['entity']
+
+                    # Handle slug collisions for blog_post
+                    if page_type == 'blog_post' and 'slug' in entity_data:
+                        original_slug = entity_data['slug']
+                        if original_slug in seen_slugs:
+                            # Collision detected - append hash of URL
+                            url = entity_data.get('canonical_url') or entity_data.get('source_file', '')
+                            hash_suffix = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+                            entity_data['slug'] = f"{original_slug}-{hash_suffix}"
+                            stats['slug_collisions'] += 1
+                            logger.debug(f"Slug collision resolved: {original_slug} -> {entity_data['slug']}")
+                        seen_slugs[entity_data['slug']] = True
+
+                    # Write entity data
+                    if page_type in entity_files:
+                        entity_files[page_type].write(orjson.dumps(entity_data) + b'\n')
+                        stats['by_type'][page_type] = stats['by_type'].get(page_type, 0) + 1
+
+                    # Write reviews if present
+                    if 'reviews' in result and result['reviews']:
+                        for review in result['reviews']:
+                            entity_files['review'].write(orjson.dumps(review) + b'\n')
+                        stats['by_type']['review'] = stats['by_type'].get('review', 0) + len(result['reviews'])
+
+                    stats['processed'] += 1
+
+                    if stats['processed'] % 10 == 0:
+                        logger.info(f"Processed {stats['processed']}/{stats['total']} files...")
 
-            except Exception as e:
-                logger.error(f"Error processing {html_path}: {e}")
-                stats['errors'] += 1
+                except Exception as e:
+                    logger.error(f"Error processing {html_path}: {e}")
+                    stats['errors'] += 1
+
+        self.selector_hits = dict(selector_hits)
 
         # Close output files
         for f in entity_files.values():
@@ -629,6 +907,40 @@ class DoctifyExtractor:
             logger.info(f"  {entity_type}: {count}")
 
 
+def _init_worker(level: int):
+    """Carry the parent's log level into a worker process"""
+    # Resolved in the worker, so it is this module's logger even when spawn re-imports it as __mp_main__
+    logger.setLevel(level)
+
+
+# One extractor per worker process, so schemas are loaded and compiled once
+_WORKER_EXTRACTORS: Dict[tuple, DoctifyExtractor] = {}
+
+
+def _process_one(job: tuple) -> tuple:
+    """
+    Process a single file in a worker process.
+
+    Args:
+        job: (html_path, schema_dir, mirror_dir, parser)
+
+    Returns:
+        (html_path, result, selector hits for this file, error message or None)
+    """
+    html_path, schema_dir, mirror_dir, parser = job
+    key = (schema_dir, mirror_dir, parser)
+    extractor = _WORKER_EXTRACTORS.get(key)
+    if extractor is None:
+        extractor = _WORKER_EXTRACTORS[key] = DoctifyExtractor(schema_dir, mirror_dir, parser)
+
+    extractor.selector_hits = {}
+    try:
+        result = extractor.process_file(html_path)
+    except Exception as e:
+        return html_path, None, Counter(extractor.selector_hits), str(e)
+    return html_path, result, Counter(extractor.selector_hits), None
+
+
 def main():
     """Main entry point for the extraction script"""
     import argparse
@@ -638,6 +950,8 @@ def main():
     parser.add_argument('--mirror-dir', default='mirror', help='Directory containing mirrored HTML files')
     parser.add_argument('--output-dir', default='mirror/extracted', help='Output directory for extracted data')
     parser.add_argument('--format', default='jsonl', choices=['jsonl', 'json', 'csv'], help='Output format')
+    parser.add_argument('--parser', default=DEFAULT_PARSER, choices=PARSERS,
+                        help='HTML parser backend (lxml, or lexbor via selectolax)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
 
     args = parser.parse_args()
@@ -646,7 +960,7 @@ def main():
         logger.setLevel(logging.DEBUG)
 
     # Initialize and run extractor
-    extractor = DoctifyExtractor(schema_dir=args.schema_dir, mirror_dir=args.mirror_dir)
+    extractor = DoctifyExtractor(schema_dir=args.schema_dir, mirror_dir=args.mirror_dir, parser=args.parser)
     extractor.process_directory(output_dir=args.output_dir, format=args.format)
 
 
@@ -4,12 +4,13 @@ Doctify Data Validation Pipeline
 Validates extracted data against entity schema definitions.
 """
 
+import hashlib
 import json
 import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-from collections import defaultdict
+from collections import Counter, namedtuple
 import logging
 
 try:
@@ -19,6 +20,13 @@ except ImportError:
     print("Install with: pip install pyyaml")
     sys.exit(1)
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # stdlib json also accepts bytes, just slower
+    orjson = None
+    _loads = json.loads
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,18 +34,77 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Compiled once; the validators run for every URL/email field of every entity.
+# Case-insensitivity is scoped to the scheme and localhost so host labels match
+# on plain ASCII classes, and the path alternative is tried longest-first.
+_URL_RE = re.compile(
+    r'^(?i:https?://)'  # http:// or https://
+    r'(?:(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,6}\.?|'  # domain...
+    r'(?i:localhost)|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:[/?]\S+|/)?$')
+# Kept as a regex: an rpartition('@') + frozenset scan measured ~3x slower in CPython
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Schema type -> (accepted Python types, excluded subtype, name used in errors).
+# bool is excluded from the numeric types since it subclasses int.
+_TYPE_CHECKS = {
+    'string': (str, None, 'string'),
+    'integer': (int, bool, 'integer'),
+    'float': ((int, float), bool, 'float'),
+    'boolean': (bool, None, 'boolean'),
+    'array': (list, None, 'array'),
+    'array[string]': (list, None, 'array'),
+    'object': (dict, None, 'object'),
+    # String subtypes
+    'url': (str, None, 'string'),
+    'email': (str, None, 'string'),
+    'text': (str, None, 'string'),
+    'html': (str, None, 'string'),
+    # Dates are accepted as strings
+    'date': (str, None, 'datetime string'),
+    'datetime': (str, None, 'datetime string'),
+}
+
+# A field schema flattened at load time, so per-entity validation does no dict lookups
+FieldSpec = namedtuple('FieldSpec', 'name required type enum enum_set is_rating')
+
+
+def _field_spec(field_name: str, field_schema: Dict) -> FieldSpec:
+    """Flatten one field schema; enum_set is None when the enum values are unhashable"""
+    enum = field_schema.get('enum')
+    enum_set = None
+    if enum is not None:
+        try:
+            enum_set = frozenset(enum)
+        except TypeError:
+            pass
+    return FieldSpec(
+        field_name,
+        bool(field_schema.get('required', False)),
+        field_schema.get('type', 'string'),
+        enum,
+        enum_set,
+        'rating' in field_name.lower(),
+    )
+
 
 class DataValidator:
     """Validates extracted data against schema definitions"""
 
-    def __init__(self, schema_dir: str = "schema"):
+    def __init__(self, schema_dir: str = "schema", hash_keys: bool = False, coverage_all: bool = False):
         """
         Initialize validator with schema directory.
 
         Args:
             schema_dir: Path to directory containing schema YAML files
+            hash_keys: Track seen primary keys as 8-byte digests instead of full strings
+            coverage_all: Count every field seen in field coverage, not just schema fields
         """
         self.schema_dir = Path(schema_dir)
+        self.hash_keys = hash_keys
+        self.coverage_all = coverage_all
         self.entities_schema = None
         self._load_schema()
 
@@ -51,6 +118,20 @@ class DataValidator:
         with open(schema_path, 'r', encoding='utf-8') as f:
             self.entities_schema = yaml.safe_load(f)
 
+        # entity_type -> (field specs, primary key), resolved once instead of per entity
+        self._entity_index = {
+            entity_type: (
+                [_field_spec(name, fs) for name, fs in entity_schema.get('fields', {}).items()],
+                entity_schema.get('primary_key'),
+            )
+            for entity_type, entity_schema in self.entities_schema.get('entities', {}).items()
+            if entity_schema
+        }
+        self._field_names = {
+            entity_type: frozenset(spec.name for spec in field_specs)
+            for entity_type, (field_specs, _) in self._entity_index.items()
+        }
+
         logger.info("Schema loaded successfully")
 
     def validate_field(self, field_name: str, value: Any, field_schema: Dict) -> List[str]:
@@ -65,20 +146,25 @@ class DataValidator:
         Returns:
             List of validation error messages (empty if valid)
         """
+        return self._check_field(_field_spec(field_name, field_schema), value)
+
+    def _check_field(self, spec: FieldSpec, value: Any) -> List[str]:
+        """validate_field against a pre-flattened FieldSpec"""
         errors = []
+        field_name = spec.name
 
         # Check if required field is present
-        if field_schema.get('required', False):
+        if spec.required:
             if value is None or value == '' or value == []:
                 errors.append(f"Required field '{field_name}' is missing or empty")
                 return errors
 
         # Skip validation for non-required null values
-        if value is None and not field_schema.get('required', False):
+        elif value is None:
             return errors
 
         # Validate data type
-        field_type = field_schema.get('type', 'string')
+        field_type = spec.type
         type_error = self._validate_type(field_name, value, field_type)
         if type_error:
             errors.append(type_error)
@@ -95,7 +181,7 @@ class DataValidator:
 
         elif field_type == 'float':
             # Check rating range if applicable
-            if 'rating' in field_name.lower():
+            if spec.is_rating:
                 if not (0 <= value <= 5):
                     errors.append(f"Field '{field_name}' rating value {value} is out of range (0-5)")
 
@@ -104,11 +190,14 @@ class DataValidator:
                 errors.append(f"Field '{field_name}' has negative integer value: {value}")
 
         # Check enum values
-        if 'enum' in field_schema:
-            allowed_values = field_schema['enum']
-            if value not in allowed_values:
+        if spec.enum is not None:
+            try:
+                allowed = value in spec.enum_set
+            except TypeError:  # unhashable value or enum
+                allowed = value in spec.enum
+            if not allowed:
                 errors.append(
-                    f"Field '{field_name}' value '{value}' not in allowed values: {allowed_values}"
+                    f"Field '{field_name}' value '{value}' not in allowed values: {spec.enum}"
                 )
 
         return errors
@@ -125,64 +214,30 @@ class DataValidator:
         Returns:
             Error message if type is wrong, None if correct
         """
-        if expected_type == 'string':
-            if not isinstance(value, str):
-                return f"Field '{field_name}' expected string, got {type(value).__name__}"
-
-        elif expected_type == 'integer':
-            if not isinstance(value, int) or isinstance(value, bool):
-                return f"Field '{field_name}' expected integer, got {type(value).__name__}"
-
-        elif expected_type == 'float':
-            if not isinstance(value, (int, float)) or isinstance(value, bool):
-                return f"Field '{field_name}' expected float, got {type(value).__name__}"
+        spec = _TYPE_CHECKS.get(expected_type)
+        if spec is None:
+            return None
 
-        elif expected_type == 'boolean':
-            if not isinstance(value, bool):
-                return f"Field '{field_name}' expected boolean, got {type(value).__name__}"
-
-        elif expected_type in ('array', 'array[string]'):
-            if not isinstance(value, list):
-                return f"Field '{field_name}' expected array, got {type(value).__name__}"
-
-        elif expected_type == 'object':
-            if not isinstance(value, dict):
-                return f"Field '{field_name}' expected object, got {type(value).__name__}"
-
-        elif expected_type in ('url', 'email', 'text', 'html'):
-            # These are string subtypes
-            if not isinstance(value, str):
-                return f"Field '{field_name}' expected string, got {type(value).__name__}"
-
-        elif expected_type in ('date', 'datetime'):
-            # Accept strings for dates/datetimes
-            if not isinstance(value, str):
-                return f"Field '{field_name}' expected datetime string, got {type(value).__name__}"
+        accepted, excluded, label = spec
+        if not isinstance(value, accepted) or (excluded is not None and isinstance(value, excluded)):
+            return f"Field '{field_name}' expected {label}, got {type(value).__name__}"
 
         return None
 
     def _is_valid_url(self, url: str) -> bool:
         """Validate URL format"""
-        if not isinstance(url, str):
+        # Cheap rejections first; the scheme is matched case-insensitively
+        if not isinstance(url, str) or url[:4].lower() != 'http':
             return False
 
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-
-        return bool(url_pattern.match(url))
+        return bool(_URL_RE.match(url))
 
     def _is_valid_email(self, email: str) -> bool:
         """Validate email format"""
-        if not isinstance(email, str):
+        if not isinstance(email, str) or '@' not in email or '.' not in email:
             return False
 
-        email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-        return bool(email_pattern.match(email))
+        return bool(_EMAIL_RE.match(email))
 
     def validate_entity(self, entity_data: Dict, entity_type: str) -> Tuple[bool, List[str]]:
         """
@@ -198,21 +253,20 @@ class DataValidator:
         errors = []
 
         # Get entity schema
-        entity_schema = self.entities_schema.get('entities', {}).get(entity_type)
-        if not entity_schema:
+        entity_spec = self._entity_index.get(entity_type)
+        if entity_spec is None:
             errors.append(f"Unknown entity type: {entity_type}")
             return False, errors
 
-        field_schemas = entity_schema.get('fields', {})
+        field_specs, primary_key = entity_spec
 
         # Validate each field in the schema
-        for field_name, field_schema in field_schemas.items():
-            value = entity_data.get(field_name)
-            field_errors = self.validate_field(field_name, value, field_schema)
-            errors.extend(field_errors)
+        for spec in field_specs:
+            field_errors = self._check_field(spec, entity_data.get(spec.name))
+            if field_errors:
+                errors.extend(field_errors)
 
         # Check for primary key
-        primary_key = entity_schema.get('primary_key')
         if primary_key:
             pk_value = entity_data.get(primary_key)
             if not pk_value:
@@ -221,13 +275,14 @@ class DataValidator:
         is_valid = len(errors) == 0
         return is_valid, errors
 
-    def validate_file(self, jsonl_path: Path, entity_type: str) -> Dict:
+    def validate_file(self, jsonl_path: Path, entity_type: str, sample_count: int = 5) -> Dict:
         """
         Validate all entities in a JSONL file.
 
         Args:
             jsonl_path: Path to JSONL file
             entity_type: Type of entities in the file
+            sample_count: Number of leading records to keep under '_samples'
 
         Returns:
             Dictionary with validation statistics and errors
@@ -240,29 +295,38 @@ class DataValidator:
             'invalid': 0,
             'errors': [],
             'primary_key_duplicates': [],
-            'field_coverage': defaultdict(int)
+            'field_coverage': Counter(),
+            '_samples': []
         }
 
         seen_keys = set()
-        entity_schema = self.entities_schema.get('entities', {}).get(entity_type, {})
-        primary_key = entity_schema.get('primary_key')
+        _, primary_key = self._entity_index.get(entity_type, ({}, None))
+        # Coverage counts schema fields only; types without a schema count every key
+        coverage_fields = None if self.coverage_all else self._field_names.get(entity_type)
 
         if not jsonl_path.exists():
             logger.warning(f"File not found: {jsonl_path}")
             return stats
 
-        with open(jsonl_path, 'r', encoding='utf-8') as f:
+        # Raw byte lines go straight to the parser, skipping a separate UTF-8 decode
+        with open(jsonl_path, 'rb') as f:
             for line_num, line in enumerate(f, 1):
                 if not line.strip():
                     continue
 
                 try:
-                    entity_data = json.loads(line)
+                    entity_data = _loads(line)
                     stats['total'] += 1
 
+                    if len(stats['_samples']) < sample_count:
+                        stats['_samples'].append(entity_data)
+
                     # Track field coverage
-                    for field in entity_data.keys():
-                        stats['field_coverage'][field] += 1
+                    if coverage_fields is None:
+                        stats['field_coverage'].update(entity_data.keys())
+                    else:
+                        # Entity key order, so the report is the same from run to run
+                        stats['field_coverage'].update(k for k in entity_data if k in coverage_fields)
 
                     # Validate entity
                     is_valid, errors = self.validate_entity(entity_data, entity_type)
@@ -283,12 +347,15 @@ class DataValidator:
                     if primary_key:
                         pk_value = entity_data.get(primary_key)
                         if pk_value:
-                            if pk_value in seen_keys:
+                            seen_key = pk_value
+                            if self.hash_keys and isinstance(pk_value, str):
+                                seen_key = hashlib.blake2b(pk_value.encode('utf-8'), digest_size=8).digest()
+                            if seen_key in seen_keys:
                                 stats['primary_key_duplicates'].append({
                                     'line': line_num,
                                     'key': pk_value
                                 })
-                            seen_keys.add(pk_value)
+                            seen_keys.add(seen_key)
 
                 except json.JSONDecodeError as e:
                     stats['invalid'] += 1
@@ -319,47 +386,39 @@ class DataValidator:
             jsonl_file = data_path / f"{entity_type}.jsonl"
             if jsonl_file.exists():
                 results[entity_type] = self.validate_file(jsonl_file, entity_type)
-                # Create sample file
-                self._create_sample_file(jsonl_file, data_path, entity_type)
+                # Create sample file from the records validate_file already parsed
+                self._create_sample_file(results[entity_type].pop('_samples'), data_path, entity_type)
             else:
                 logger.info(f"No file found for {entity_type}, skipping")
 
         # Save validation report
         report_path = data_path / "validation_report.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            # Convert defaultdict to regular dict for JSON serialization
-            results_serializable = {}
-            for entity_type, stats in results.items():
-                results_serializable[entity_type] = {
-                    'total': stats['total'],
-                    'valid': stats['valid'],
-                    'invalid': stats['invalid'],
-                    'errors': stats['errors'],
-                    'primary_key_duplicates': stats['primary_key_duplicates'],
-                    'field_coverage': dict(stats['field_coverage'])
-                }
-            json.dump(results_serializable, f, indent=2)
+        # Convert Counter to regular dict for JSON serialization
+        results_serializable = {}
+        for entity_type, stats in results.items():
+            results_serializable[entity_type] = {
+                'total': stats['total'],
+                'valid': stats['valid'],
+                'invalid': stats['invalid'],
+                'errors': stats['errors'],
+                'primary_key_duplicates': stats['primary_key_duplicates'],
+                'field_coverage': dict(stats['field_coverage'])
+            }
+        if orjson is not None:
+            report_path.write_bytes(orjson.dumps(results_serializable, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(results_serializable, f, indent=2)
         logger.info(f"Validation report saved to: {report_path}")
 
         return results
 
-    def _create_sample_file(self, jsonl_file: Path, output_dir: Path, entity_type: str, sample_count: int = 5):
-        """Create a sample file with first N records"""
+    def _create_sample_file(self, samples: List[Dict], output_dir: Path, entity_type: str):
+        """Write the first N records of an entity file to samples/<entity_type>_sample.json"""
         sample_dir = output_dir / "samples"
         sample_dir.mkdir(exist_ok=True)
 
         sample_file = sample_dir / f"{entity_type}_sample.json"
-        samples = []
-
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for i, line in enumerate(f):
-                if i >= sample_count:
-                    break
-                if line.strip():
-                    try:
-                        samples.append(json.loads(line))
-                    except:
-                        pass
 
         with open(sample_file, 'w', encoding='utf-8') as f:
             json.dump(samples, f, indent=2, ensure_ascii=False)
@@ -438,6 +497,11 @@ def main():
     parser.add_argument('--schema-dir', default='schema', help='Directory containing schema files')
     parser.add_argument('--data-dir', default='mirror/extracted', help='Directory containing extracted JSONL files')
     parser.add_argument('--entity-type', help='Validate specific entity type only')
+    parser.add_argument('--hash-keys', action='store_true',
+                        help='Store seen primary keys as 8-byte hashes; memory still grows per key, '
+                             'but each key costs less (about 30%% less for typical slugs)')
+    parser.add_argument('--coverage-all', action='store_true',
+                        help='Report coverage for every field seen, not just fields declared in the schema')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
 
     args = parser.parse_args()
@@ -446,7 +510,8 @@ def main():
         logger.setLevel(logging.DEBUG)
 
     # Initialize validator
-    validator = DataValidator(schema_dir=args.schema_dir)
+    validator = DataValidator(schema_dir=args.schema_dir, hash_keys=args.hash_keys,
+                              coverage_all=args.coverage_all)
 
     # Validate data
     if args.entity_type:
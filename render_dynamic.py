@@ -1,4 +1,4 @@
-import asyncio, json, hashlib
+import argparse, asyncio, json, hashlib
 from pathlib import Path
 from playwright.async_api import async_playwright
 import urllib.parse as up
@@ -7,6 +7,9 @@ OUT = Path("mirror")
 REND = OUT / "rendered"
 META = OUT / "meta"
 REND.mkdir(parents=True, exist_ok=True)
+CONCURRENCY = 2  # pages in flight
+RENDER_DELAY = 1.0  # seconds between navigations to the same host
+FLUSH_EVERY = 20
 
 def url_to_path(u: str) -> Path:
     sp = up.urlsplit(u)
@@ -20,58 +23,90 @@ def url_to_path(u: str) -> Path:
         p = REND / safe / "index.html"
     return p
 
-async def render(urls):
+async def render(urls, concurrency=CONCURRENCY, delay=RENDER_DELAY):
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         ctx = await browser.new_context(user_agent="SolVX-Mirror/1.0 (Playwright)")
-        page = await ctx.new_page()
         idx_fp = (META / "crawl_index.jsonl").open("a", encoding="utf-8")
+        # Renders are network-bound; keep a few pages in flight on the shared context
+        sem = asyncio.Semaphore(concurrency)
+        written = 0
 
-        for url in urls:
-            try:
-                await page.goto(url, wait_until="networkidle", timeout=60000)
-                # Gentle scroll to load lazy elements
-                for _ in range(5):
-                    await page.mouse.wheel(0, 1200)
-                    await page.wait_for_timeout(400)
+        loop = asyncio.get_running_loop()
+        last_fetch = {}
+        host_locks = {}
 
-                html = await page.content()
-                path = url_to_path(url)
-                path.parent.mkdir(parents=True, exist_ok=True)
-                path.write_text(html, encoding="utf-8")
+        async def wait_turn(host: str):
+            # Space out navigations per host, whatever the concurrency
+            lock = host_locks.setdefault(host, asyncio.Lock())
+            async with lock:
+                wait = last_fetch.get(host, 0.0) + delay - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                last_fetch[host] = loop.time()
 
-                h = hashlib.sha256(html.encode("utf-8")).hexdigest()
-                idx_fp.write(json.dumps({
-                    "url": url,
-                    "status": 200,
-                    "sha256": h,
-                    "saved": str(path.relative_to(OUT)),
-                    "type": "rendered",
-                }) + "\n")
-                idx_fp.flush()
-                await page.wait_for_timeout(500)
+        async def render_one(url):
+            nonlocal written
+            async with sem:
+                page = None
+                try:
+                    page = await ctx.new_page()
+                    await wait_turn(up.urlsplit(url).netloc)
+                    await page.goto(url, wait_until="networkidle", timeout=60000)
+                    # Gentle scroll to load lazy elements
+                    for _ in range(5):
+                        await page.mouse.wheel(0, 1200)
+                        await page.wait_for_timeout(400)
 
-            except Exception as e:
-                print(f"[WARN] Failed {url}: {e}")
-                continue
+                    # Encode once; the same bytes are saved and fingerprinted
+                    html_bytes = (await page.content()).encode("utf-8")
+                    path = url_to_path(url)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_bytes(html_bytes)
 
-        await browser.close()
+                    h = hashlib.sha256(html_bytes).hexdigest()
+                    # One write call per record, so concurrent renders never interleave lines
+                    idx_fp.write(json.dumps({
+                        "url": url,
+                        "status": 200,
+                        "sha256": h,
+                        "saved": str(path.relative_to(OUT)),
+                        "type": "rendered",
+                    }) + "\n")
+                    written += 1
+                    if written % FLUSH_EVERY == 0:
+                        idx_fp.flush()
+
+                except Exception as e:
+                    print(f"[WARN] Failed {url}: {e}")
+                finally:
+                    if page is not None:
+                        await page.close()
+
+        try:
+            await asyncio.gather(*(render_one(url) for url in urls))
+        finally:
+            idx_fp.flush()
+            idx_fp.close()
+            await browser.close()
 
 def unique_urls():
     q = META / "dynamic_queue.txt"
     if not q.exists():
         return []
-    seen, urls = set(), []
-    for line in q.read_text(encoding="utf-8").splitlines():
-        u = line.strip()
-        if u and u not in seen:
-            seen.add(u)
-            urls.append(u)
-    return urls
+    lines = (line.strip() for line in q.read_text(encoding="utf-8").splitlines())
+    # dict keys keep first-seen order
+    return list(dict.fromkeys(u for u in lines if u))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render queued dynamic pages with Playwright")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Pages rendered at once")
+    parser.add_argument("--delay", type=float, default=RENDER_DELAY,
+                        help="Minimum seconds between navigations to the same host")
+    args = parser.parse_args()
+
     urls = unique_urls()
     if urls:
-        asyncio.run(render(urls))
+        asyncio.run(render(urls, concurrency=max(1, args.concurrency), delay=args.delay))
     else:
         print("No dynamic URLs found.")
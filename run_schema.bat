@@ -10,7 +10,7 @@ call .venv\Scripts\activate
 if exist requirements.txt (
   pip install -q -r requirements.txt
 ) else (
-  pip install -q beautifulsoup4 pyyaml lxml
+  pip install -q lxml cssselect orjson pyyaml
 )
 python pipelines\extract.py || exit /b 1
 python pipelines\validate.py || exit /b 1
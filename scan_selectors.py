@@ -7,7 +7,76 @@ import json
 import os
 from pathlib import Path
 from collections import defaultdict
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+import lxml.html
+import orjson
+from cssselect import HTMLTranslator
+from lxml.etree import ParserError, XPath
+
+# Rendered pages are written as UTF-8 by render_dynamic.py
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_CSS_TRANSLATOR = HTMLTranslator()
+
+def _xpath(expr):
+    """Compile an XPath that yields only the first match in document order"""
+    return XPath(f"({expr})[1]")
+
+def _css(selector):
+    return _xpath(_CSS_TRANSLATOR.css_to_xpath(selector))
+
+# Text nodes BeautifulSoup's get_text() counts: script/style/template/ruby
+# annotation strings and comments are left out
+_TEXT_NODES = XPath(
+    "descendant::text()[not(ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]",
+    smart_strings=False,
+)
+
+def _text(elem):
+    """Same result as BeautifulSoup's get_text(strip=True)"""
+    return ''.join(s.strip() for s in _TEXT_NODES(elem))
+
+def _first(tree, xpath):
+    found = xpath(tree)
+    return found[0] if found else None
+
+# (report name, compiled selector) per field, evaluated in order.
+# Multi-valued attributes (class, rel) match on whitespace-separated tokens.
+_TITLE_SELECTORS = [
+    ('title', _xpath('//title')),
+    ('meta[og:title]', _xpath('//meta[@property="og:title"]')),
+    ('h1', _xpath('//h1')),
+    ('h1.elementor-heading-title', _css('h1.elementor-heading-title')),
+    ('.elementor-widget-theme-post-title h1', _css('.elementor-widget-theme-post-title h1')),
+]
+
+_CANONICAL_SELECTORS = [
+    ('link[rel="canonical"]', _css('link[rel~="canonical"]')),
+    ('meta[property="og:url"]', _xpath('//meta[@property="og:url"]')),
+]
+
+_AUTHOR_SELECTORS = [
+    ('meta[name="author"]', _xpath('//meta[@name="author"]')),
+    ('.elementor-post-info__item--type-author', _css('.elementor-post-info__item--type-author')),
+    ('[itemprop="author"]', _xpath('//*[@itemprop="author"]')),
+]
+
+_DATE_SELECTORS = [
+    ('meta[property="article:published_time"]', _xpath('//meta[@property="article:published_time"]')),
+    ('time[datetime]', _xpath('//time[@datetime]')),
+    ('.elementor-post-info__item--type-date', _css('.elementor-post-info__item--type-date')),
+]
+
+_CONTENT_SELECTORS = [
+    ('.elementor-widget-theme-post-content', _css('.elementor-widget-theme-post-content')),
+    ('.post-content-container', _css('.post-content-container')),
+    ('article .entry-content', _css('article .entry-content')),
+    ('.blog-content', _css('.blog-content')),
+    ('main article', _css('main article')),
+]
+
+_JSON_LD = _xpath('//script[@type="application/ld+json"]')
+_JSON_LD_NAME = "script[type='application/ld+json']"
 
 def scan_html_files(mirror_dir, max_files=60):
     """Scan HTML files and identify selectors"""
@@ -24,7 +93,7 @@ def scan_html_files(mirror_dir, max_files=60):
     other_pages = []
 
     for html_file in html_files:
-        path_str = str(html_file).replace("\\", "/")  # Normalize path separators
+        path_str = html_file.as_posix()  # Normalize path separators
         if "/blog/posts/" in path_str and "/page/" not in path_str and "/categories/" not in path_str:
             blog_posts.append(html_file)
         elif "/case-studies/" in path_str or "/case-study/" in path_str:
@@ -43,145 +112,118 @@ def scan_html_files(mirror_dir, max_files=60):
     sample_other = other_pages[:20]
 
     samples = sample_blog + sample_case + sample_other
+    page_types = (["blog_post"] * len(sample_blog) + ["case_study"] * len(sample_case)
+                  + ["unknown"] * len(sample_other))
+    samples, page_types = samples[:max_files], page_types[:max_files]
 
     print(f"\nScanning {len(samples)} sample files...\n")
 
-    for i, html_file in enumerate(samples):
-        if i >= max_files:
-            break
+    # Parse in worker processes; only the small per-page records come back
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        outcomes = ex.map(_analyze_file, samples, [rendered_dir] * len(samples), chunksize=4)
+        for i, (html_file, page_type, (data, error)) in enumerate(zip(samples, page_types, outcomes)):
+            if error:
+                print(f"Error processing {html_file}: {error}")
+                continue
 
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-                soup = BeautifulSoup(html_content, 'html.parser')
-
-                page_type = "unknown"
-                if html_file in blog_posts:
-                    page_type = "blog_post"
-                elif html_file in case_studies:
-                    page_type = "case_study"
-
-                # Extract metadata and selectors
-                analyze_page(soup, page_type, results, str(html_file.relative_to(rendered_dir)))
-
-                if (i + 1) % 10 == 0:
-                    print(f"Processed {i + 1}/{len(samples)} files...")
+            if data is not None:
+                record_page(results, page_type, data)
 
-        except Exception as e:
-            print(f"Error processing {html_file}: {e}")
+            if (i + 1) % 10 == 0:
+                print(f"Processed {i + 1}/{len(samples)} files...")
 
     return results
 
-def analyze_page(soup, page_type, results, file_path):
-    """Analyze a single page and record selectors"""
+def _analyze_file(html_file, rendered_dir):
+    """Parse and analyze one page in a worker; returns (record or None, error message or None)"""
+    try:
+        with open(html_file, 'rb') as f:
+            html_content = f.read()
+        try:
+            tree = lxml.html.document_fromstring(html_content, parser=_HTML_PARSER).getroottree()
+        except ParserError:
+            # Empty document: nothing to record
+            return None, None
+        return analyze_page(tree, str(html_file.relative_to(rendered_dir))), None
+    except Exception as e:
+        return None, str(e)
+
+def analyze_page(tree, file_path):
+    """Analyze a single page (an lxml tree) and return the selectors that hit"""
 
-    data = {"file": file_path, "selectors": {}}
+    selectors = defaultdict(list)
 
     # Title selectors
-    title_selectors = [
-        ('title', lambda s: s.find('title')),
-        ('meta[og:title]', lambda s: s.find('meta', property='og:title')),
-        ('h1', lambda s: s.find('h1')),
-        ('h1.elementor-heading-title', lambda s: s.find('h1', class_='elementor-heading-title')),
-        ('.elementor-widget-theme-post-title h1', lambda s: s.select_one('.elementor-widget-theme-post-title h1')),
-    ]
-
-    for selector_name, selector_func in title_selectors:
-        elem = selector_func(soup)
-        if elem:
-            text = elem.get('content') if elem.name == 'meta' else elem.get_text(strip=True)
+    for selector_name, xpath in _TITLE_SELECTORS:
+        elem = _first(tree, xpath)
+        if elem is not None:
+            text = elem.get('content') if elem.tag == 'meta' else _text(elem)
             if text:
-                data["selectors"]["title"] = data["selectors"].get("title", [])
-                data["selectors"]["title"].append({
+                selectors["title"].append({
                     "selector": selector_name,
                     "sample": text[:100]
                 })
 
     # Canonical URL
-    canonical_selectors = [
-        ('link[rel="canonical"]', lambda s: s.find('link', rel='canonical')),
-        ('meta[property="og:url"]', lambda s: s.find('meta', property='og:url')),
-    ]
-
-    for selector_name, selector_func in canonical_selectors:
-        elem = selector_func(soup)
-        if elem:
+    for selector_name, xpath in _CANONICAL_SELECTORS:
+        elem = _first(tree, xpath)
+        if elem is not None:
             url = elem.get('href') or elem.get('content')
             if url:
-                data["selectors"]["canonical_url"] = data["selectors"].get("canonical_url", [])
-                data["selectors"]["canonical_url"].append({
+                selectors["canonical_url"].append({
                     "selector": selector_name,
                     "sample": url[:100]
                 })
 
     # Author
-    author_selectors = [
-        ('meta[name="author"]', lambda s: s.find('meta', attrs={'name': 'author'})),
-        ('.elementor-post-info__item--type-author', lambda s: s.select_one('.elementor-post-info__item--type-author')),
-        ('[itemprop="author"]', lambda s: s.find(attrs={'itemprop': 'author'})),
-    ]
-
-    for selector_name, selector_func in author_selectors:
-        elem = selector_func(soup)
-        if elem:
-            text = elem.get('content') if elem.name == 'meta' else elem.get_text(strip=True)
+    for selector_name, xpath in _AUTHOR_SELECTORS:
+        elem = _first(tree, xpath)
+        if elem is not None:
+            text = elem.get('content') if elem.tag == 'meta' else _text(elem)
             if text:
-                data["selectors"]["author"] = data["selectors"].get("author", [])
-                data["selectors"]["author"].append({
+                selectors["author"].append({
                     "selector": selector_name,
                     "sample": text[:100]
                 })
 
     # Published date
-    date_selectors = [
-        ('meta[property="article:published_time"]', lambda s: s.find('meta', property='article:published_time')),
-        ('time[datetime]', lambda s: s.find('time', attrs={'datetime': True})),
-        ('.elementor-post-info__item--type-date', lambda s: s.select_one('.elementor-post-info__item--type-date')),
-    ]
-
-    for selector_name, selector_func in date_selectors:
-        elem = selector_func(soup)
-        if elem:
-            date = elem.get('content') or elem.get('datetime') or elem.get_text(strip=True)
+    for selector_name, xpath in _DATE_SELECTORS:
+        elem = _first(tree, xpath)
+        if elem is not None:
+            date = elem.get('content') or elem.get('datetime') or _text(elem)
             if date:
-                data["selectors"]["published_date"] = data["selectors"].get("published_date", [])
-                data["selectors"]["published_date"].append({
+                selectors["published_date"].append({
                     "selector": selector_name,
                     "sample": date[:50]
                 })
 
     # Content
-    content_selectors = [
-        ('.elementor-widget-theme-post-content', lambda s: s.select_one('.elementor-widget-theme-post-content')),
-        ('.post-content-container', lambda s: s.select_one('.post-content-container')),
-        ('article .entry-content', lambda s: s.select_one('article .entry-content')),
-        ('.blog-content', lambda s: s.select_one('.blog-content')),
-        ('main article', lambda s: s.select_one('main article')),
-    ]
-
-    for selector_name, selector_func in content_selectors:
-        elem = selector_func(soup)
-        if elem:
-            text = elem.get_text(strip=True)
+    for selector_name, xpath in _CONTENT_SELECTORS:
+        elem = _first(tree, xpath)
+        if elem is not None:
+            text = _text(elem)
             if text and len(text) > 100:  # Only count substantial content
-                data["selectors"]["content"] = data["selectors"].get("content", [])
-                data["selectors"]["content"].append({
+                selectors["content"].append({
                     "selector": selector_name,
                     "sample": text[:200]
                 })
 
     # JSON-LD structured data
-    json_ld = soup.find('script', type='application/ld+json')
-    if json_ld:
+    json_ld = _first(tree, _JSON_LD)
+    if json_ld is not None:
         try:
-            ld_data = json.loads(json_ld.string)
-            data["selectors"]["json_ld"] = [{
-                "selector": "script[type='application/ld+json']",
+            ld_data = json.loads(json_ld.text)
+            selectors["json_ld"] = [{
+                "selector": _JSON_LD_NAME,
                 "sample": "Found"
             }]
         except:
             pass
 
+    return {"file": file_path, "selectors": dict(selectors)}
+
+def record_page(results, page_type, data):
+    """Add one page's selector record to the per-page-type results"""
     # Record results
     if data["selectors"]:
         results[page_type]["pages"].append(data)
@@ -226,7 +268,7 @@ if __name__ == "__main__":
             "selector_hits": dict(results[page_type]["selector_hits"])
         }
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
 
     print(f"\n\nDetailed results saved to: {output_file}")
@@ -30,7 +30,7 @@ python -m pip install --upgrade pip >nul
 
 REM Install dependencies
 echo [INFO] Installing dependencies...
-pip install requests beautifulsoup4 playwright >nul
+pip install -r requirements.txt >nul
 
 REM Install browser if missing
 if not exist "%USERPROFILE%\.cache\ms-playwright" (